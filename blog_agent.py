@@ -12,9 +12,28 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime
-from blog_engine import BlogEngine
+from blog_engine import BlogEngine, MAX_POSTS_PER_REQUEST
 from utils import print_banner, print_success, print_error, print_info
 
+def positive_int(value: str) -> int:
+    """argparse type: an integer >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def posts_per_request(value: str) -> int:
+    """argparse type: topics per AI request, 1..MAX_POSTS_PER_REQUEST"""
+    number = positive_int(value)
+    if number > MAX_POSTS_PER_REQUEST:
+        raise argparse.ArgumentTypeError(
+            f"at most {MAX_POSTS_PER_REQUEST} posts fit in one request's output budget, got {number}"
+        )
+    return number
+
 def main():
     """Main CLI interface for the blog writing agent"""
 
@@ -52,12 +71,33 @@ Examples:
                         choices=['draft', 'publish', 'private'],
                         help='📝 WordPress post status (default: draft)')
 
+    parser.add_argument('--legacy-wp', action='store_true',
+                        help='🐢 Publish over the old XML-RPC API instead of the REST API')
+
     parser.add_argument('--output-dir', '-o', type=str, default='blog_posts',
                         help='📁 Output directory for markdown files (default: blog_posts)')
 
     parser.add_argument('--model', '-m', type=str, default='openai/gpt-4o-mini',
                         help='🤖 AI model to use (default: openai/gpt-4o-mini)')
 
+    parser.add_argument('--concurrency', type=positive_int, default=10,
+                        help='⚡ Max concurrent AI generations for --generate-all (default: 10)')
+
+    parser.add_argument('--posts-per-request', type=posts_per_request, default=1, metavar='K',
+                        help=f'📦 Pack K topics (max {MAX_POSTS_PER_REQUEST}) into each AI request for --generate-all (default: 1)')
+
+    parser.add_argument('--batch-api', action='store_true',
+                        help='📬 Run --generate-all through the OpenAI Batch API (cheaper, slower; needs OPENAI_API_KEY)')
+
+    parser.add_argument('--max-rpm', type=positive_int, default=500,
+                        help='🚦 Max AI requests per minute (default: 500)')
+
+    parser.add_argument('--max-tpm', type=positive_int, default=90000,
+                        help='🚦 Max AI tokens per minute (default: 90000)')
+
+    parser.add_argument('--no-cache', action='store_true',
+                        help='♻️ Ignore cached AI responses and regenerate (fresh results still refresh the cache)')
+
     args = parser.parse_args()
 
     # Initialize the blog engine
@@ -67,7 +107,11 @@ Examples:
             output_dir=args.output_dir,
             ai_model=args.model,
             wordpress_enabled=args.to_wordpress,
-            wp_status=args.wp_status
+            wp_status=args.wp_status,
+            max_rpm=args.max_rpm,
+            max_tpm=args.max_tpm,
+            use_cache=not args.no_cache,
+            legacy_wp=args.legacy_wp
         )
         print_success("✅ Blog Engine initialized successfully!")
 
@@ -83,7 +127,11 @@ Examples:
         blog_engine.generate_blog_post(row_number=args.generate)
 
     elif args.generate_all:
-        blog_engine.generate_all_blog_posts()
+        blog_engine.generate_all_blog_posts(
+            concurrency=args.concurrency,
+            posts_per_request=args.posts_per_request,
+            use_batch_api=args.batch_api
+        )
 
     elif args.custom:
         blog_engine.generate_custom_blog_post(topic=args.custom)
@@ -93,5 +141,7 @@ Examples:
         print_info("\\n💡 Pro tip: Start with --list to see available topics!")
         print_info("💡 Add --to-wordpress to publish directly to WordPress!")
 
+    blog_engine.close()
+
 if __name__ == "__main__":
     main()
@@ -6,32 +6,131 @@ Author: mstf
 Handles Google Sheets integration, AI generation, file output, AND WordPress publishing!
 """
 
-import gspread
-from google.oauth2.service_account import Credentials
-from openai import OpenAI
+# Heavy third-party imports (gspread, openai, httpx, markdown, aiofiles) are deferred
+# to the methods that need them, so --help and friends start fast.
+import asyncio
+import hashlib
+import json
 import os
+import random
 import re
-import markdown
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-from utils import print_success, print_error, print_info, print_warning
-from wordpress_client import WordPressClient
+from typing import List, Optional, Union
+from utils import print_success, print_error, print_info, print_warning, print_lines, RateLimiter
+from wordpress_client import WordPressClient, WordPressRestClient
+
+# Retry settings for transient AI failures (the retryable openai error types are bound in _init_ai_client)
+AI_MAX_ATTEMPTS = 5
+AI_BACKOFF_BASE = 1.0  # seconds
+
+# Precompiled patterns for filenames and the fallback markdown converter
+_RE_NONALNUM = re.compile(r'[^a-zA-Z0-9\s-]')
+_RE_WS = re.compile(r'\s+')
+_RE_H3 = re.compile(r'^### (.+)$', re.MULTILINE)
+_RE_H2 = re.compile(r'^## (.+)$', re.MULTILINE)
+_RE_H1 = re.compile(r'^# (.+)$', re.MULTILINE)
+_RE_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_RE_ITAL = re.compile(r'\*(.+?)\*')
+
+# On-disk copy of the sheet rows, keyed by the spreadsheet's Drive modifiedTime
+SHEET_CACHE_FILE = "_sheet_cache.json"
+
+# OpenAI Batch API settings (OpenRouter has no batch endpoint, so this path talks to OpenAI directly)
+BATCH_API_BASE_URL = "https://api.openai.com/v1"
+BATCH_POLL_INTERVAL = 30  # seconds
+BATCH_TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+# Prefix of the first line the AI is asked to write
+META_PREFIX = "META_DESCRIPTION:"
+
+# Separator between posts when several topics share one AI request
+POST_BOUNDARY = "<<<POST_BOUNDARY>>>"
+
+# Completion budget per post, and the most posts one request may carry
+# (2000 tokens each must stay under the model's ~16k output-token limit)
+POST_MAX_TOKENS = 2000
+MAX_COMPLETION_TOKENS = 16000
+MAX_POSTS_PER_REQUEST = MAX_COMPLETION_TOKENS // POST_MAX_TOKENS
+
+# Publishes in flight at once when no --concurrency applies (also the XML-RPC pool size)
+PUBLISH_CONCURRENCY = 4
+
+BLOG_REQUIREMENTS = """Requirements:
+- FIRST: Write a compelling meta description (150-160 characters) that includes primary keywords
+- Format the meta description as: META_DESCRIPTION: [your description here]
+- Then write the blog post in markdown format
+- Include a compelling title with # header
+- Add an engaging introduction
+- Create 3-5 main sections with ## headers
+- Include practical tips, examples, or insights
+- Add a strong conclusion
+- Use bullet points and numbered lists where appropriate
+- Make it SEO-friendly but natural and engaging
+- Aim for 800-1200 words
+- Include relevant emojis to make it more engaging
+
+IMPORTANT: Start your response with the meta description line, then add a blank line, then write the blog post.
+
+Example format:
+META_DESCRIPTION: Learn how digital marketing transforms businesses with proven strategies that boost sales, increase brand awareness, and drive customer engagement in 2025.
+
+# Your Blog Post Title Here
+...rest of the blog content...
+
+Write a high-quality blog post that would rank well and provide real value to readers.
+"""
+
+@dataclass(slots=True)
+class Topic:
+    """One blog topic (a sheet row, or an ad-hoc --custom topic)"""
+    row_number: Union[int, str]  # 'custom' for ad-hoc topics
+    primary_keywords: str
+    auxiliary_keywords: str
+    title: str
 
 class BlogEngine:
     """Core blog writing engine that combines Google Sheets + AI + WordPress"""
 
     def __init__(self, output_dir: str = "blog_posts", ai_model: str = "openai/gpt-4o-mini",
-                 wordpress_enabled: bool = False, wp_status: str = "draft"):
+                 wordpress_enabled: bool = False, wp_status: str = "draft",
+                 max_rpm: int = 500, max_tpm: int = 90000, use_cache: bool = True,
+                 legacy_wp: bool = False):
         """Initialize the blog engine"""
         self.output_dir = Path(output_dir)
         self.ai_model = ai_model
         self.wordpress_enabled = wordpress_enabled
         self.wp_status = wp_status
+        self.legacy_wp = legacy_wp
         self.sheet_data = []
+        self._by_row = {}
+
+        # Content-addressed AI response cache; with use_cache off we still write fresh results
+        self.use_cache = use_cache
+        self.cache_dir = self.output_dir / '.cache'
+
+        # Throttle for concurrent AI requests
+        self.rate_limiter = RateLimiter(rpm=max_rpm, tpm=max_tpm)
+
+        # Legacy XML-RPC publishing is blocking, so it runs on a small thread pool
+        self._wp_pool = ThreadPoolExecutor(max_workers=PUBLISH_CONCURRENCY)
+        # One XML-RPC client per pool thread - a ServerProxy connection can't be shared
+        self._wp_local = threading.local()
+        # Bounds concurrent publishes so they can't exhaust the shared HTTP pool; set per run
+        self._publish_sem = None
+
+        # Markdown engine is built (and its extensions loaded) once, on first use.
+        # Markdown instances aren't thread-safe and publishes run on the pool, hence the lock.
+        self._md = None
+        self._md_lock = threading.Lock()
 
         # Create output directory
         self.output_dir.mkdir(exist_ok=True)
+        self.cache_dir.mkdir(exist_ok=True)
 
         # Initialize Google Sheets client
         self._init_sheets_client()
@@ -49,6 +148,9 @@ class BlogEngine:
     def _init_sheets_client(self):
         """Initialize Google Sheets client"""
         try:
+            import gspread
+            from google.oauth2.service_account import Credentials
+
             SCOPES = [
                 'https://www.googleapis.com/auth/spreadsheets',
                 'https://www.googleapis.com/auth/drive'
@@ -68,6 +170,8 @@ class BlogEngine:
     def _init_ai_client(self):
         """Initialize OpenAI client"""
         try:
+            from openai import OpenAI, RateLimitError, APITimeoutError, APIConnectionError
+
             # Load API key from environment variable
             api_key = os.environ.get("OPENROUTER_API_KEY")
             if not api_key:
@@ -76,15 +180,27 @@ class BlogEngine:
                 base_url="https://openrouter.ai/api/v1",
                 api_key=api_key,
             )
+            # The async client and its connection pool are created per event-loop run (_open_async_clients)
+            self._api_key = api_key
+            self._http = None
+            self.async_ai_client = None
+
+            # Transient failures worth retrying with backoff
+            self._retryable_ai_errors = (RateLimitError, APITimeoutError, APIConnectionError)
             print_info("🤖 AI client initialized")
 
         except Exception as e:
             raise Exception(f"Failed to initialize AI client: {e}")
 
     def _init_wordpress_client(self):
-        """Initialize WordPress client"""
+        """Initialize WordPress client (REST API by default, XML-RPC with legacy_wp)"""
         try:
-            self.wp_client = WordPressClient()
+            if self.legacy_wp:
+                self.wp_client = WordPressClient()
+            else:
+                # Publishes share the AI client's connection pool, attached per run in _open_async_clients
+                self.wp_client = WordPressRestClient()
+
             if self.wp_client.test_connection():
                 print_info("🚀 WordPress client initialized and connected!")
             else:
@@ -98,36 +214,79 @@ class BlogEngine:
             self.wordpress_enabled = False
 
     def _load_sheet_data(self):
-        """Load data from Google Sheets"""
+        """Load data from Google Sheets (cached on disk until the spreadsheet changes)"""
         try:
             SPREADSHEET_ID = "1Ek6eNBGc2X0RIynWh-_MgfHDAeX-9Xyoa7VL43LaoZI"
 
             # Open the spreadsheet
             sheet = self.gc.open_by_key(SPREADSHEET_ID)
-            worksheet = sheet.worksheets()[0]  # First worksheet
 
-            # Get headers
-            headers = worksheet.get("A1:C1")[0]
+            # Skip the data fetch entirely if the sheet hasn't changed since we cached it
+            revision_id = self._get_sheet_revision(sheet)
+            all_data = self._read_sheet_cache(revision_id)
 
-            # Get all data
-            all_data = worksheet.get("A2:C")
+            if all_data is None:
+                worksheet = sheet.worksheets()[0]  # First worksheet
+
+                # Headers and all data in a single request
+                headers, all_data = worksheet.batch_get(["A1:C1", "A2:C"])
+                all_data = [list(row) for row in all_data]
+
+                self._write_sheet_cache(revision_id, all_data)
+            else:
+                print_info("⚡ Using cached sheet data (spreadsheet unchanged)")
 
-            # Format data as list of dictionaries
+            # Format data as list of topics
             self.sheet_data = []
             for i, row in enumerate(all_data, 1):
                 if len(row) >= 3:
-                    self.sheet_data.append({
-                        'row_number': i,
-                        'primary_keywords': row[0],
-                        'auxiliary_keywords': row[1],
-                        'title': row[2]
-                    })
+                    self.sheet_data.append(Topic(i, row[0], row[1], row[2]))
+
+            # Index by row number for O(1) lookups
+            self._by_row = {item.row_number: item for item in self.sheet_data}
 
             print_info(f"📋 Loaded {len(self.sheet_data)} blog topics from Google Sheets")
 
         except Exception as e:
             raise Exception(f"Failed to load sheet data: {e}")
 
+    def _get_sheet_revision(self, sheet) -> Optional[str]:
+        """Get the spreadsheet's last modified time from Drive, or None if unavailable"""
+        try:
+            # Fresh Drive modifiedTime lookup (the lastUpdateTime property is deprecated and goes stale)
+            return sheet.get_lastUpdateTime()
+        except Exception as e:
+            print_warning(f"⚠️ Could not check sheet modified time, skipping cache: {e}")
+            return None
+
+    def _read_sheet_cache(self, revision_id: Optional[str]) -> Optional[List[List[str]]]:
+        """Return cached rows if they were saved for this revision, else None"""
+        if revision_id is None:
+            return None
+
+        cache_path = self.output_dir / SHEET_CACHE_FILE
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if cache.get('revision_id') != revision_id:
+            return None
+        return cache.get('rows')
+
+    def _write_sheet_cache(self, revision_id: Optional[str], rows: List[List[str]]):
+        """Save rows for this revision; a failed write only costs a refetch next time"""
+        if revision_id is None:
+            return
+
+        cache_path = self.output_dir / SHEET_CACHE_FILE
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'revision_id': revision_id, 'rows': rows}, f)
+        except OSError as e:
+            print_warning(f"⚠️ Could not write sheet cache: {e}")
+
     def list_topics(self):
         """List all available blog topics"""
         print_info("\\n📋 Available Blog Topics:")
@@ -137,13 +296,16 @@ class BlogEngine:
             print_warning("No topics found in Google Sheets!")
             return
 
+        # Build the whole listing and write it once
+        lines = []
         for item in self.sheet_data:
-            print(f"Row {item['row_number']}: {item['title']}")
-            print(f"   🎯 Primary: {item['primary_keywords']}")
-            print(f"   🔗 Auxiliary: {item['auxiliary_keywords']}")
-            print("-" * 60)
+            lines.append(f"Row {item.row_number}: {item.title}")
+            lines.append(f"   🎯 Primary: {item.primary_keywords}")
+            lines.append(f"   🔗 Auxiliary: {item.auxiliary_keywords}")
+            lines.append("-" * 60)
 
-        print(f"\\n💡 Total: {len(self.sheet_data)} blog topics available")
+        lines.append(f"\\n💡 Total: {len(self.sheet_data)} blog topics available")
+        print_lines(lines)
 
         if self.wordpress_enabled:
             print_info("🚀 WordPress publishing is ENABLED")
@@ -153,92 +315,362 @@ class BlogEngine:
     def generate_blog_post(self, row_number: int):
         """Generate a blog post for a specific row"""
         # Find the topic
-        topic_data = None
-        for item in self.sheet_data:
-            if item['row_number'] == row_number:
-                topic_data = item
-                break
+        topic_data = self._by_row.get(row_number)
 
         if not topic_data:
             print_error(f"❌ Row {row_number} not found!")
             return
 
-        print_info(f"✍️ Generating blog post for: {topic_data['title']}")
+        print_info(f"✍️ Generating blog post for: {topic_data.title}")
+        self._run_async(self._generate_one_async(topic_data))
 
-        # Generate the blog content
-        ai_content = self._generate_ai_content(topic_data)
+    def generate_all_blog_posts(self, concurrency: int = 10, posts_per_request: int = 1,
+                                use_batch_api: bool = False):
+        """Generate blog posts for ALL topics (BEAST MODE!)"""
+        print_info(f"🔥 BEAST MODE ACTIVATED! Generating {len(self.sheet_data)} blog posts...")
 
-        # Extract meta description and clean content
-        meta_description, blog_content = self._extract_meta_description(ai_content)
-        print_info(f"📋 Meta description: {meta_description}")
+        if self.wordpress_enabled:
+            print_info("🚀 WordPress publishing is ENABLED for all posts!")
 
-        # Save to markdown file
-        filename = self._save_blog_post(topic_data, blog_content, meta_description)
+        if use_batch_api:
+            print_info("📬 Using the OpenAI Batch API (results may take a while)")
+            try:
+                results = self._generate_all_batch_api()
+            except Exception as e:
+                print_error(f"❌ Batch API run failed: {e}")
+                return
+        else:
+            print_info(f"⚡ Running up to {concurrency} generations concurrently")
+            posts_per_request = min(posts_per_request, MAX_POSTS_PER_REQUEST)
+            if posts_per_request > 1:
+                print_info(f"📦 Packing up to {posts_per_request} posts into each AI request")
+            results = self._run_async(self._generate_all_async(concurrency, posts_per_request))
+
+        generated_count = 0
+        published_count = 0
+
+        for topic_data, result in zip(self.sheet_data, results):
+            if isinstance(result, Exception):
+                print_error(f"❌ Failed to generate {topic_data.title}: {result}")
+                continue
+
+            generated_count += 1
+            if result:
+                published_count += 1
+
+        print_success(f"🎉 BEAST MODE COMPLETE!")
+        print_success(f"📝 Generated: {generated_count}/{len(self.sheet_data)} markdown files")
+        if self.wordpress_enabled:
+            print_success(f"🚀 Published: {published_count}/{len(self.sheet_data)} WordPress posts")
+
+    async def _generate_all_async(self, concurrency: int, posts_per_request: int = 1) -> List:
+        """Dispatch every topic concurrently, bounded by a semaphore. Returns one result per topic."""
+        sem = asyncio.Semaphore(concurrency)
+        # Publishing gets its own slots so it doesn't hold up generation
+        self._publish_sem = asyncio.Semaphore(concurrency)
+        if posts_per_request <= 1:
+            return await asyncio.gather(
+                *[self._process_topic(sem, topic_data) for topic_data in self.sheet_data],
+                return_exceptions=True
+            )
+
+        chunks = [self.sheet_data[i:i + posts_per_request]
+                  for i in range(0, len(self.sheet_data), posts_per_request)]
+        chunk_results = await asyncio.gather(
+            *[self._process_chunk(sem, chunk) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        # Flatten back to one result per topic; a failed chunk fails all of its topics
+        results = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            if isinstance(chunk_result, Exception):
+                results.extend([chunk_result] * len(chunk))
+            else:
+                results.extend(chunk_result)
+        return results
+
+    def _generate_all_batch_api(self) -> List:
+        """Generate every topic through one OpenAI Batch API job. Returns one result per topic."""
+        # Cached responses don't need to go in the batch at all
+        contents = {}
+        pending = []
+        for topic_data in self.sheet_data:
+            cached = self._read_cached_content(self._build_prompt(topic_data))
+            if cached is not None:
+                contents[f"row-{topic_data.row_number}"] = cached
+            else:
+                pending.append(topic_data)
+
+        if contents:
+            print_info(f"💾 {len(contents)} posts found in the response cache")
+        if pending:
+            contents.update(self._run_batch_job(pending))
+
+        # Run the usual pipeline on every result: extract -> save -> publish
+        results = []
+        to_publish = []
+        for topic_data in self.sheet_data:
+            ai_content = contents.get(f"row-{topic_data.row_number}",
+                                      Exception("No result returned in batch output"))
+            if isinstance(ai_content, Exception):
+                results.append(ai_content)
+                continue
+
+            try:
+                meta_description, blog_content = self._extract_meta_description(ai_content)
+                filename = self._save_blog_post(topic_data, blog_content, meta_description)
+                print_success(f"📝 Markdown: {filename}")
+                results.append(None)
+                to_publish.append((len(results) - 1, topic_data, blog_content, meta_description))
+            except Exception as e:
+                results.append(e)
+
+        if self.wordpress_enabled and to_publish:
+            wp_post_ids = self._run_async(self._publish_many_async([item[1:] for item in to_publish]))
+            for (index, topic_data, _, _), wp_post_id in zip(to_publish, wp_post_ids):
+                results[index] = wp_post_id
+                if wp_post_id:
+                    print_success(f"🚀 WordPress ID: {wp_post_id}")
+                else:
+                    print_error(f"❌ WordPress publishing failed for {topic_data.title}")
+
+        return results
+
+    def _run_batch_job(self, topics: List[Topic]) -> dict:
+        """Submit one Batch API job for the topics and wait for it. Returns {custom_id: content or Exception}."""
+        client = self._init_batch_client()
+        # OpenRouter-style "openai/gpt-4o-mini" -> OpenAI's "gpt-4o-mini"
+        model = self.ai_model.removeprefix('openai/')
+
+        # One request per topic, keyed by row number
+        prompts = {f"row-{topic_data.row_number}": self._build_prompt(topic_data) for topic_data in topics}
+        input_path = self.output_dir / 'batch_input.jsonl'
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for custom_id, prompt in prompts.items():
+                request = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {**self._completion_body(prompt), "model": model}
+                }
+                f.write(json.dumps(request) + "\n")
+
+        with open(input_path, 'rb') as f:
+            batch_file = client.files.create(file=f, purpose='batch')
+
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        print_info(f"📬 Submitted batch {batch.id} with {len(topics)} requests")
+
+        # Wait for the job to finish
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts:
+                print_info(f"⏳ Batch {batch.status}: {counts.completed}/{counts.total} done, {counts.failed} failed")
+            else:
+                print_info(f"⏳ Batch {batch.status}")
+
+        if batch.status != 'completed':
+            raise Exception(f"Batch {batch.id} ended with status '{batch.status}'")
+
+        # Collect generated content per custom_id
+        contents = {}
+        if batch.output_file_id:
+            output = client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                custom_id = record['custom_id']
+                response = record.get('response') or {}
+                if record.get('error') or response.get('status_code') != 200:
+                    contents[custom_id] = Exception(f"Batch request failed: {record.get('error') or response}")
+                else:
+                    content = response['body']['choices'][0]['message']['content'].strip()
+                    contents[custom_id] = content
+                    if custom_id in prompts:
+                        self._write_cached_content(prompts[custom_id], content)
+
+        return contents
+
+    def _init_batch_client(self):
+        """Create an OpenAI client for the Batch API"""
+        from openai import OpenAI
+
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise Exception("OPENAI_API_KEY not found in environment. The Batch API needs a direct OpenAI key.")
+        return OpenAI(base_url=BATCH_API_BASE_URL, api_key=api_key)
+
+    def _open_async_clients(self):
+        """Create the shared httpx pool and async AI client for the current event loop"""
+        import httpx
+        from openai import AsyncOpenAI
+
+        # One shared connection pool so concurrent completions reuse keep-alive connections
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            http2=True
+        )
+
+        # Async client for concurrent generation
+        self.async_ai_client = AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=self._api_key,
+            http_client=self._http,
+            # _with_retries is the only retry layer, so every attempt goes through the rate limiter
+            max_retries=0,
+        )
+
+        if isinstance(getattr(self, 'wp_client', None), WordPressRestClient):
+            self.wp_client.http_client = self._http
+
+        # Runs driven by --concurrency replace this with a semaphore of that size
+        self._publish_sem = asyncio.Semaphore(PUBLISH_CONCURRENCY)
+
+    async def aclose(self):
+        """Close the async HTTP connection pool of the current run"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self.async_ai_client = None
+            if isinstance(getattr(self, 'wp_client', None), WordPressRestClient):
+                self.wp_client.http_client = None
+
+    def close(self):
+        """Release the WordPress publishing threads (the engine can't publish over XML-RPC afterwards)"""
+        self._wp_pool.shutdown(wait=True)
+
+    def _run_async(self, coro):
+        """Run a coroutine in a fresh event loop with its own HTTP pool, closed again afterwards"""
+        async def runner():
+            # The pool is bound to this event loop, so it's created and closed inside it
+            self._open_async_clients()
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+
+        return asyncio.run(runner())
+
+    async def _generate_one_async(self, topic_data: Topic):
+        """Stream a single post to disk, then publish it (used by --generate)"""
+        # Stream the blog content straight into the markdown file
+        filename, meta_description, blog_content = await self._stream_blog_post_async(topic_data)
+        print_info(f"📋 Meta description: {meta_description}")
         print_success(f"📝 Markdown saved: {filename}")
 
         # Publish to WordPress if enabled
         if self.wordpress_enabled:
-            wp_post_id = self._publish_to_wordpress(topic_data, blog_content, meta_description)
+            wp_post_id = await self._publish_post_async(topic_data, blog_content, meta_description)
             if wp_post_id:
                 print_success(f"🚀 Published to WordPress! Post ID: {wp_post_id}")
             else:
                 print_error("❌ WordPress publishing failed")
 
-    def generate_all_blog_posts(self):
-        """Generate blog posts for ALL topics (BEAST MODE!)"""
-        print_info(f"🔥 BEAST MODE ACTIVATED! Generating {len(self.sheet_data)} blog posts...")
+    async def _process_topic(self, sem: asyncio.Semaphore, topic_data: Topic) -> Optional[int]:
+        """Generate, save and (optionally) publish a single topic. Returns the WordPress post ID if published."""
+        async with sem:
+            print_info(f"✍️ Generating: {topic_data.title}")
+            filename, meta_description, blog_content = await self._stream_blog_post_async(topic_data)
+
+        print_success(f"📝 Markdown: {filename}")
+        return await self._publish_async(topic_data, blog_content, meta_description)
+
+    async def _process_chunk(self, sem: asyncio.Semaphore, chunk: List[Topic]) -> List:
+        """Generate several topics in one AI request, then save/publish each. Returns one result per topic."""
+        async with sem:
+            print_info(f"✍️ Generating {len(chunk)} posts: " + ", ".join(t.title for t in chunk))
+            ai_contents = await self._generate_ai_content_batch(chunk)
+
+        async def finish(topic_data: Topic, ai_content: Optional[str]) -> Optional[int]:
+            if ai_content is None:
+                # The packed response couldn't be split - generate alone, one semaphore slot per request
+                async with sem:
+                    ai_content = await self._generate_ai_content_async(topic_data)
+            return await self._finish_topic(topic_data, ai_content)
+
+        return await asyncio.gather(
+            *[finish(topic_data, ai_content) for topic_data, ai_content in zip(chunk, ai_contents)],
+            return_exceptions=True
+        )
+
+    async def _finish_topic(self, topic_data: Topic, ai_content: str) -> Optional[int]:
+        """Save and (optionally) publish generated content. Returns the WordPress post ID if published."""
+        filename, meta_description, blog_content = await self._save_ai_content_async(topic_data, ai_content)
+        print_success(f"📝 Markdown: {filename}")
+
+        return await self._publish_async(topic_data, blog_content, meta_description)
+
+    async def _save_ai_content_async(self, topic_data: Topic, ai_content: str) -> tuple[str, str, str]:
+        """Split off the meta description and save the markdown. Returns (filename, meta_description, blog_content)."""
+        meta_description, blog_content = self._extract_meta_description(ai_content)
+        filename = await self._save_blog_post_async(topic_data, blog_content, meta_description)
+        return filename, meta_description, blog_content
 
+    async def _publish_async(self, topic_data: Topic, blog_content: str, meta_description: str) -> Optional[int]:
+        """Publish if enabled and report the outcome. Returns the WordPress post ID if published."""
+        # The generation slot is already free for the next topic while this runs
+        wp_post_id = None
         if self.wordpress_enabled:
-            print_info("🚀 WordPress publishing is ENABLED for all posts!")
-
-        generated_count = 0
-        published_count = 0
-
-        for topic_data in self.sheet_data:
-            try:
-                print_info(f"✍️ Generating: {topic_data['title']}")
+            wp_post_id = await self._publish_post_async(topic_data, blog_content, meta_description)
+            if wp_post_id:
+                print_success(f"🚀 WordPress ID: {wp_post_id}")
+            else:
+                print_error("❌ WordPress publishing failed")
 
-                # Generate content
-                ai_content = self._generate_ai_content(topic_data)
+        return wp_post_id
 
-                # Extract meta description and clean content
-                meta_description, blog_content = self._extract_meta_description(ai_content)
+    async def _publish_post_async(self, topic_data: Topic, content: str, meta_description: str) -> Optional[int]:
+        """Publish blog post to WordPress without blocking the event loop"""
+        if not self.wordpress_enabled or not hasattr(self, 'wp_client'):
+            return None
 
-                # Save markdown
-                filename = self._save_blog_post(topic_data, blog_content, meta_description)
-                generated_count += 1
-                print_success(f"📝 Markdown: {filename}")
+        async with self._publish_sem:
+            if self.legacy_wp:
+                # XML-RPC is synchronous - run it on the thread pool
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._wp_pool, self._publish_to_wordpress, topic_data, content, meta_description
+                )
 
-                # Publish to WordPress if enabled
-                if self.wordpress_enabled:
-                    wp_post_id = self._publish_to_wordpress(topic_data, blog_content, meta_description)
-                    if wp_post_id:
-                        published_count += 1
-                        print_success(f"🚀 WordPress ID: {wp_post_id}")
-                    else:
-                        print_error("❌ WordPress publishing failed")
+            try:
+                # Markdown conversion is CPU work, keep it off the loop
+                html_content = await asyncio.to_thread(self._markdown_to_html, content)
 
-                print("-" * 50)
+                return await self.wp_client.create_post(
+                    title=topic_data.title,
+                    content=html_content,
+                    meta_description=meta_description,
+                    status=self.wp_status
+                )
 
             except Exception as e:
-                print_error(f"❌ Failed to generate {topic_data['title']}: {e}")
+                print_error(f"WordPress publishing error: {e}")
+                return None
 
-        print_success(f"🎉 BEAST MODE COMPLETE!")
-        print_success(f"📝 Generated: {generated_count}/{len(self.sheet_data)} markdown files")
-        if self.wordpress_enabled:
-            print_success(f"🚀 Published: {published_count}/{len(self.sheet_data)} WordPress posts")
+    async def _publish_many_async(self, items: List[tuple]) -> List[Optional[int]]:
+        """Publish several (topic_data, content, meta_description) posts concurrently, a few at a time"""
+        return await asyncio.gather(*[self._publish_post_async(*item) for item in items])
 
     def generate_custom_blog_post(self, topic: str):
         """Generate a custom blog post for any topic"""
         print_info(f"🎨 Generating custom blog post for: {topic}")
 
         # Create custom topic data
-        custom_data = {
-            'row_number': 'custom',
-            'primary_keywords': topic,
-            'auxiliary_keywords': '',
-            'title': topic
-        }
+        custom_data = Topic(
+            row_number='custom',
+            primary_keywords=topic,
+            auxiliary_keywords='',
+            title=topic
+        )
 
         # Generate the blog content
         ai_content = self._generate_ai_content(custom_data)
@@ -252,95 +684,340 @@ class BlogEngine:
 
         # Publish to WordPress if enabled
         if self.wordpress_enabled:
-            wp_post_id = self._publish_to_wordpress(custom_data, blog_content, meta_description)
+            wp_post_id = self._run_async(self._publish_post_async(custom_data, blog_content, meta_description))
             if wp_post_id:
                 print_success(f"🚀 Published to WordPress! Post ID: {wp_post_id}")
             else:
                 print_error("❌ WordPress publishing failed")
 
-    def _generate_ai_content(self, topic_data: Dict) -> str:
-        """Generate blog content using AI"""
+    def _build_prompt(self, topic_data: Topic) -> str:
+        """Build the blog generation prompt for a topic"""
+        return f"""
+Write an engaging, comprehensive blog post about "{topic_data.title}".
 
-        # Create the prompt
-        prompt = f"""
-Write an engaging, comprehensive blog post about "{topic_data['title']}".
+Primary keywords to focus on: {topic_data.primary_keywords}
+Auxiliary keywords to include: {topic_data.auxiliary_keywords}
 
-Primary keywords to focus on: {topic_data['primary_keywords']}
-Auxiliary keywords to include: {topic_data['auxiliary_keywords']}
+""" + BLOG_REQUIREMENTS
 
-Requirements:
-- FIRST: Write a compelling meta description (150-160 characters) that includes primary keywords
-- Format the meta description as: META_DESCRIPTION: [your description here]
-- Then write the blog post in markdown format
-- Include a compelling title with # header
-- Add an engaging introduction
-- Create 3-5 main sections with ## headers
-- Include practical tips, examples, or insights
-- Add a strong conclusion
-- Use bullet points and numbered lists where appropriate
-- Make it SEO-friendly but natural and engaging
-- Aim for 800-1200 words
-- Include relevant emojis to make it more engaging
+    def _build_batch_prompt(self, topics: List[Topic]) -> str:
+        """Build a single prompt asking for one independent blog post per topic"""
+        topic_lines = "\n".join(
+            f"""Topic {i}: "{topic_data.title}"
+   Primary keywords to focus on: {topic_data.primary_keywords}
+   Auxiliary keywords to include: {topic_data.auxiliary_keywords}"""
+            for i, topic_data in enumerate(topics, 1)
+        )
 
-IMPORTANT: Start your response with the meta description line, then add a blank line, then write the blog post.
+        return f"""
+Produce {len(topics)} independent, engaging, comprehensive blog posts - one for each topic below, in the same order.
+Separate each post from the next with a line containing only {POST_BOUNDARY}
 
-Example format:
-META_DESCRIPTION: Learn how digital marketing transforms businesses with proven strategies that boost sales, increase brand awareness, and drive customer engagement in 2025.
+{topic_lines}
 
-# Your Blog Post Title Here
-...rest of the blog content...
+Apply ALL of the following to EACH post individually:
 
-Write a high-quality blog post that would rank well and provide real value to readers.
-"""
+""" + BLOG_REQUIREMENTS
+
+    def _generate_ai_content(self, topic_data: Topic) -> str:
+        """Generate blog content using AI"""
+        prompt = self._build_prompt(topic_data)
+
+        cached = self._cached_content(prompt, topic_data.title)
+        if cached is not None:
+            return cached
 
         try:
-            completion = self.ai_client.chat.completions.create(
-                model=self.ai_model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            completion = self.ai_client.chat.completions.create(**self._completion_body(prompt))
 
-            return completion.choices[0].message.content.strip()
+            content = completion.choices[0].message.content.strip()
 
         except Exception as e:
             raise Exception(f"AI generation failed: {e}")
 
+        self._write_cached_content(prompt, content)
+        return content
+
+    async def _generate_ai_content_async(self, topic_data: Topic) -> str:
+        """Generate blog content using the async AI client"""
+        return await self._create_completion_async(self._build_prompt(topic_data), POST_MAX_TOKENS, topic_data.title)
+
+    async def _generate_ai_content_batch(self, topics: List[Topic]) -> List[Optional[str]]:
+        """Generate several blog posts with ONE AI request.
+
+        Each post is cached under its own single-topic prompt, so cached topics are skipped
+        and only the misses get packed into the request. If the response can't be split back
+        into one post per topic, those entries are None and the caller regenerates them one by one.
+        """
+        contents = [self._read_cached_content(self._build_prompt(topic_data)) for topic_data in topics]
+        misses = [i for i, content in enumerate(contents) if content is None]
+        if len(misses) < len(topics):
+            print_info(f"💾 {len(topics) - len(misses)} of {len(topics)} posts found in the response cache")
+        if not misses:
+            return contents
+
+        pending = [topics[i] for i in misses]
+        if len(pending) == 1:
+            generated = [await self._generate_ai_content_async(pending[0])]
+        else:
+            prompt = self._build_batch_prompt(pending)
+            label = f"{len(pending)} posts starting with '{pending[0].title}'"
+            # The combined response is cached per topic below, not under the combined prompt
+            max_tokens = min(POST_MAX_TOKENS * len(pending), MAX_COMPLETION_TOKENS)
+            content = await self._create_completion_async(prompt, max_tokens, label, use_cache=False)
+
+            posts = [post.strip() for post in content.split(POST_BOUNDARY)]
+            posts = [post for post in posts if post]  # Tolerate a trailing boundary
+            if len(posts) == len(pending):
+                for topic_data, post in zip(pending, posts):
+                    self._write_cached_content(self._build_prompt(topic_data), post)
+                generated = posts
+            else:
+                print_warning(f"⚠️ Expected {len(pending)} posts but got {len(posts)} - generating them one by one")
+                generated = [None] * len(pending)
+
+        for i, content in zip(misses, generated):
+            contents[i] = content
+        return contents
+
+    async def _create_completion_async(self, prompt: str, max_tokens: int, label: str, use_cache: bool = True) -> str:
+        """Run one throttled chat completion, retrying transient failures with backoff"""
+        if use_cache:
+            cached = self._cached_content(prompt, label)
+            if cached is not None:
+                return cached
+
+        async def attempt() -> str:
+            completion = await self._request_completion_async(prompt, max_tokens)
+            return completion.choices[0].message.content.strip()
+
+        # Rough estimate: ~4 chars per prompt token plus the completion budget
+        content = await self._with_retries(attempt, len(prompt) // 4 + max_tokens, label)
+        if use_cache:
+            self._write_cached_content(prompt, content)
+        return content
+
+    async def _stream_blog_post_async(self, topic_data: Topic) -> tuple[str, str, str]:
+        """Stream a completion straight into the markdown file.
+
+        Only the first line is buffered (to read META_DESCRIPTION for the frontmatter);
+        everything after it is written as it arrives. Returns (filename, meta_description, blog_content).
+        """
+        import aiofiles
+
+        prompt = self._build_prompt(topic_data)
+
+        cached = self._cached_content(prompt, topic_data.title)
+        if cached is not None:
+            return await self._save_ai_content_async(topic_data, cached)
+
+        async def attempt() -> tuple[str, str, str]:
+            stream = await self._request_completion_async(prompt, POST_MAX_TOKENS, stream=True)
+
+            mode = 'head'        # head -> body (streaming to file) or head -> buffer (no meta line)
+            head = ""
+            parts = []
+            pending_ws = ""      # Trailing whitespace held back so the file ends like a stripped response
+            started = False
+            meta_description = ""
+            filepath = None
+            f = None
+
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content or ''
+                    if not text:
+                        continue
+
+                    if mode == 'head':
+                        head += text
+                        stripped = head.lstrip()
+                        n = min(len(stripped), len(META_PREFIX))
+                        if stripped[:n] != META_PREFIX[:n]:
+                            # No meta line to peel off - buffer it all and save the normal way
+                            mode = 'buffer'
+                            parts.append(head)
+                            continue
+                        if '\n' not in stripped:
+                            continue
+
+                        line, _, text = stripped.partition('\n')
+                        meta_description = self._parse_meta_line(line)
+                        filepath, frontmatter = self._build_blog_file(topic_data, '', meta_description)
+                        f = await aiofiles.open(filepath, 'w', encoding='utf-8')
+                        await f.write(frontmatter)
+                        mode = 'body'
+
+                    if mode == 'buffer':
+                        parts.append(text)
+                        continue
+
+                    # Body: skip leading blank lines, hold back trailing whitespace
+                    if not started:
+                        text = text.lstrip()
+                        if not text:
+                            continue
+                        started = True
+                    text = pending_ws + text
+                    body = text.rstrip()
+                    pending_ws = text[len(body):]
+                    if body:
+                        await f.write(body)
+                        parts.append(body)  # Kept for WordPress and the response cache
+
+                if mode == 'body':
+                    await f.close()
+                    blog_content = ''.join(parts)
+                    # Equivalent raw response: re-extracting it gives the same meta and body
+                    self._write_cached_content(prompt, self._join_meta_description(meta_description, blog_content))
+                    return str(filepath), meta_description, blog_content
+
+            except BaseException:
+                # Don't leave a half-written post behind (the attempt may be retried)
+                if f is not None:
+                    await f.close()
+                    filepath.unlink(missing_ok=True)
+                raise
+
+            # Never reached the body (no meta line, or a one-line response)
+            ai_content = (head if mode == 'head' else ''.join(parts)).strip()
+            self._write_cached_content(prompt, ai_content)
+            return await self._save_ai_content_async(topic_data, ai_content)
+
+        # Rough estimate: ~4 chars per prompt token plus the completion budget
+        return await self._with_retries(attempt, len(prompt) // 4 + POST_MAX_TOKENS, topic_data.title)
+
+    def _completion_body(self, prompt: str, max_tokens: int = POST_MAX_TOKENS) -> dict:
+        """Chat completion parameters shared by every request path (sync, async, streamed and Batch API)"""
+        return {
+            "model": self.ai_model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": max_tokens
+        }
+
+    async def _request_completion_async(self, prompt: str, max_tokens: int, stream: bool = False):
+        """Send one async completion request and sync the rate limiter from its headers.
+
+        Returns the parsed completion, or the chunk stream when stream is set.
+        """
+        response = await self.async_ai_client.chat.completions.with_raw_response.create(
+            **self._completion_body(prompt, max_tokens),
+            stream=stream
+        )
+
+        # Trust the server if it thinks we have less headroom than we do
+        self.rate_limiter.sync_from_headers(response.headers)
+        return response.parse()
+
+    async def _with_retries(self, attempt_fn, est_tokens: int, label: str):
+        """Run attempt_fn (one AI call) under the rate limiter, retrying transient failures with backoff"""
+        for attempt in range(1, AI_MAX_ATTEMPTS + 1):
+            await self.rate_limiter.acquire(est_tokens)
+
+            try:
+                return await attempt_fn()
+
+            except self._retryable_ai_errors as e:
+                if attempt == AI_MAX_ATTEMPTS:
+                    raise Exception(f"AI generation failed after {attempt} attempts: {e}")
+
+                delay = self._retry_delay(e, attempt)
+                print_warning(f"⏳ {type(e).__name__} for {label}, retrying in {delay:.1f}s "
+                              f"(attempt {attempt}/{AI_MAX_ATTEMPTS})")
+                await asyncio.sleep(delay)
+
+            except Exception as e:
+                raise Exception(f"AI generation failed: {e}")
+
+    def _cache_path(self, prompt: str) -> Path:
+        """Cache file for this (model, prompt) pair"""
+        key = hashlib.sha256(f"{self.ai_model}\0{prompt}".encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.txt"
+
+    def _read_cached_content(self, prompt: str) -> Optional[str]:
+        """Return the cached AI response for this prompt, or None on a miss (or with the cache disabled)"""
+        if not self.use_cache:
+            return None
+        try:
+            return self._cache_path(prompt).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def _cached_content(self, prompt: str, label: str) -> Optional[str]:
+        """Cache lookup that reports hits"""
+        cached = self._read_cached_content(prompt)
+        if cached is not None:
+            print_info(f"💾 Using cached response for: {label}")
+        return cached
+
+    def _write_cached_content(self, prompt: str, content: str):
+        """Atomically store an AI response; a failed write only costs a regeneration next time"""
+        path = self._cache_path(prompt)
+        tmp = path.with_suffix('.tmp')
+        try:
+            tmp.write_text(content, encoding='utf-8')
+            tmp.replace(path)
+        except OSError as e:
+            print_warning(f"⚠️ Could not write response cache: {e}")
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before the next attempt: the server's Retry-After if given, else full-jitter exponential backoff"""
+        response = getattr(error, 'response', None)
+        if response is not None:
+            retry_after = response.headers.get('retry-after')
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+
+        # 1s, 2s, 4s, 8s... with full jitter
+        return random.uniform(0, AI_BACKOFF_BASE * (2 ** (attempt - 1)))
+
     def _extract_meta_description(self, content: str) -> tuple[str, str]:
         """Extract meta description from AI content and return (meta_description, clean_content)"""
-        if content.startswith('META_DESCRIPTION:'):
-            lines = content.split('\n', 2)
-            if len(lines) >= 2:
-                meta_description = lines[0].replace('META_DESCRIPTION:', '').strip()
+        if content.startswith(META_PREFIX):
+            head, sep, tail = content.partition('\n')
+            if sep:
                 # Remove the meta description line and any following empty lines
-                clean_content = '\n'.join(lines[1:]).strip()
-                return meta_description, clean_content
+                return self._parse_meta_line(head), tail.strip()
 
         # Fallback: generate a basic meta description from the first paragraph
-        lines = content.split('\n')
-        first_paragraph = ""
-        for line in lines:
-            if line.strip() and not line.startswith('#'):
-                first_paragraph = line.strip()
-                break
+        first_paragraph = next(
+            (line.strip() for line in content.splitlines() if line.strip() and not line.startswith('#')),
+            ""
+        )
 
         # Create a meta description from first paragraph (limit to 160 chars)
         meta_description = first_paragraph[:157] + "..." if len(first_paragraph) > 157 else first_paragraph
 
         return meta_description, content
 
-    def _save_blog_post(self, topic_data: Dict, content: str, meta_description: str) -> str:
-        """Save blog post to markdown file"""
+    @staticmethod
+    def _parse_meta_line(line: str) -> str:
+        """Meta description from a 'META_DESCRIPTION: ...' line"""
+        return line.removeprefix(META_PREFIX).strip()
+
+    @staticmethod
+    def _join_meta_description(meta_description: str, content: str) -> str:
+        """Inverse of _extract_meta_description: the raw response with its meta line"""
+        return f"{META_PREFIX} {meta_description}\n\n{content}"
+
+    def _build_blog_file(self, topic_data: Topic, content: str, meta_description: str) -> tuple[Path, str]:
+        """Build the output path and full markdown (frontmatter + content) for a blog post"""
 
         # Create filename from title
-        title = topic_data['title']
-        filename = re.sub(r'[^a-zA-Z0-9\\s-]', '', title)  # Remove special chars
-        filename = re.sub(r'\\s+', '-', filename.strip())   # Replace spaces with hyphens
+        title = topic_data.title
+        filename = _RE_NONALNUM.sub('', title)         # Remove special chars
+        filename = _RE_WS.sub('-', filename.strip())   # Replace spaces with hyphens
         filename = filename.lower()[:50]                    # Lowercase and limit length
 
         # Add timestamp for uniqueness
@@ -352,19 +1029,23 @@ Write a high-quality blog post that would rank well and provide real value to re
 
         # Add metadata to the content
         metadata = f"""---
-title: "{topic_data['title']}"
+title: "{topic_data.title}"
 meta_description: "{meta_description}"
 date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-primary_keywords: "{topic_data['primary_keywords']}"
-auxiliary_keywords: "{topic_data['auxiliary_keywords']}"
-row_number: {topic_data['row_number']}
+primary_keywords: "{topic_data.primary_keywords}"
+auxiliary_keywords: "{topic_data.auxiliary_keywords}"
+row_number: {topic_data.row_number}
 generated_by: "Blog Writing Agent v2.0"
 wordpress_enabled: {self.wordpress_enabled}
 ---
 
 """
 
-        full_content = metadata + content
+        return filepath, metadata + content
+
+    def _save_blog_post(self, topic_data: Topic, content: str, meta_description: str) -> str:
+        """Save blog post to markdown file"""
+        filepath, full_content = self._build_blog_file(topic_data, content, meta_description)
 
         # Write to file
         try:
@@ -375,8 +1056,23 @@ wordpress_enabled: {self.wordpress_enabled}
         except Exception as e:
             raise Exception(f"Failed to save markdown file: {e}")
 
-    def _publish_to_wordpress(self, topic_data: Dict, content: str, meta_description: str) -> Optional[int]:
-        """Publish blog post to WordPress"""
+    async def _save_blog_post_async(self, topic_data: Topic, content: str, meta_description: str) -> str:
+        """Save blog post to markdown file without blocking the event loop"""
+        import aiofiles
+
+        filepath, full_content = self._build_blog_file(topic_data, content, meta_description)
+
+        # Write to file
+        try:
+            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+                await f.write(full_content)
+            return str(filepath)
+
+        except Exception as e:
+            raise Exception(f"Failed to save markdown file: {e}")
+
+    def _publish_to_wordpress(self, topic_data: Topic, content: str, meta_description: str) -> Optional[int]:
+        """Publish blog post to WordPress over legacy XML-RPC (blocking)"""
         if not self.wordpress_enabled or not hasattr(self, 'wp_client'):
             return None
 
@@ -385,8 +1081,8 @@ wordpress_enabled: {self.wordpress_enabled}
             html_content = self._markdown_to_html(content)
 
             # Create the post
-            post_id = self.wp_client.create_post(
-                title=topic_data['title'],
+            post_id = self._thread_wp_client().create_post(
+                title=topic_data.title,
                 content=html_content,
                 meta_description=meta_description,
                 status=self.wp_status
@@ -398,6 +1094,13 @@ wordpress_enabled: {self.wordpress_enabled}
             print_error(f"WordPress publishing error: {e}")
             return None
 
+    def _thread_wp_client(self) -> WordPressClient:
+        """Return this thread's XML-RPC client, creating it on first use"""
+        client = getattr(self._wp_local, 'client', None)
+        if client is None:
+            client = self._wp_local.client = WordPressClient()
+        return client
+
     def _markdown_to_html(self, markdown_content: str) -> str:
         """Convert markdown to HTML using proper markdown library"""
         try:
@@ -407,11 +1110,13 @@ wordpress_enabled: {self.wordpress_enabled}
                 if len(parts) >= 3:
                     markdown_content = parts[2].strip()
 
-            # Convert markdown to HTML using the markdown library
-            html_content = markdown.markdown(
-                markdown_content,
-                extensions=['extra', 'codehilite']
-            )
+            # Convert markdown to HTML using the shared markdown engine
+            with self._md_lock:
+                if self._md is None:
+                    import markdown
+                    self._md = markdown.Markdown(extensions=['extra', 'codehilite'], output_format='html5')
+                self._md.reset()
+                html_content = self._md.convert(markdown_content)
 
             # Clean up any remaining issues
             html_content = html_content.strip()
@@ -436,13 +1141,13 @@ wordpress_enabled: {self.wordpress_enabled}
         html_content = markdown_content
 
         # Convert headers
-        html_content = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html_content, flags=re.MULTILINE)
-        html_content = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html_content, flags=re.MULTILINE)
-        html_content = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html_content, flags=re.MULTILINE)
+        html_content = _RE_H3.sub(r'<h3>\1</h3>', html_content)
+        html_content = _RE_H2.sub(r'<h2>\1</h2>', html_content)
+        html_content = _RE_H1.sub(r'<h1>\1</h1>', html_content)
 
         # Convert bold and italic
-        html_content = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html_content)
-        html_content = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html_content)
+        html_content = _RE_BOLD.sub(r'<strong>\1</strong>', html_content)
+        html_content = _RE_ITAL.sub(r'<em>\1</em>', html_content)
 
         # Convert to paragraphs
         paragraphs = html_content.split('\n\n')
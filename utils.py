@@ -7,18 +7,36 @@ Cool terminal output functions with colors and emojis!
 """
 
 import sys
+import asyncio
+import time
 from datetime import datetime
-from colorama import init, Fore, Back, Style
+from typing import List
 import os
 
-# Initialize colorama for Windows
-init(autoreset=True)
+class _NoColor:
+    """Stand-in for colorama's Fore/Style when output isn't a terminal: every code is ''"""
 
-def print_banner():
-    """Print epic ASCII banner"""
-    banner = f"""
-{Fore.CYAN}
-╔══════════════════════════════════════════════════════════════╗
+    def __getattr__(self, name: str) -> str:
+        return ""
+
+_colors = None
+
+def _get_colorama():
+    """Return (Fore, Style), importing and initializing colorama only on first use and only for a TTY"""
+    global _colors
+    if _colors is None:
+        if sys.stdout.isatty():
+            from colorama import init, Fore, Style
+            # Initialize colorama for Windows
+            init(autoreset=True)
+            _colors = (Fore, Style)
+        else:
+            # Piped/redirected output: skip colorama and ANSI codes entirely
+            _colors = (_NoColor(), _NoColor())
+    return _colors
+
+# The banner never changes during a run, so build it once at import
+_BANNER = f"""╔══════════════════════════════════════════════════════════════╗
 ║                                                              ║
 ║     🚀 EPIC BLOG WRITING AGENT v2.0 🚀                     ║
 ║                                                              ║
@@ -27,30 +45,43 @@ def print_banner():
 ║     Created by: mstf | Date: {datetime.now().strftime("%Y-%m-%d")}                    ║
 ║                                                              ║
 ╚══════════════════════════════════════════════════════════════╝
-{Style.RESET_ALL}
 """
-    print(banner)
+
+def print_banner():
+    """Print epic ASCII banner"""
+    Fore, Style = _get_colorama()
+    sys.stdout.write(f"\n{Fore.CYAN}\n{_BANNER}{Style.RESET_ALL}\n\n")
 
 def print_success(message: str):
     """Print success message in green"""
+    Fore, Style = _get_colorama()
     print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
 
 def print_error(message: str):
     """Print error message in red"""
+    Fore, Style = _get_colorama()
     print(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
 
 def print_warning(message: str):
     """Print warning message in yellow"""
+    Fore, Style = _get_colorama()
     print(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
 
 def print_info(message: str):
     """Print info message in blue"""
+    Fore, Style = _get_colorama()
     print(f"{Fore.BLUE}ℹ️  {message}{Style.RESET_ALL}")
 
 def print_highlight(message: str):
     """Print highlighted message"""
+    Fore, Style = _get_colorama()
     print(f"{Fore.MAGENTA}🌟 {message}{Style.RESET_ALL}")
 
+def print_lines(lines: List[str]):
+    """Print many plain lines with a single write instead of one print per line"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
 def create_progress_bar(current: int, total: int, width: int = 50) -> str:
     """Create a cool progress bar"""
     progress = current / total
@@ -72,12 +103,71 @@ def safe_filename(text: str, max_length: int = 50) -> str:
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
 
     size_names = ["B", "KB", "MB", "GB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
+    # floor(log1024(n)) via bit length - exact integer math, no floats
+    i = min((size_bytes.bit_length() - 1) // 10, len(size_names) - 1)
+    p = 1 << (10 * i)
     s = round(size_bytes / p, 2)
     return f"{s} {size_names[i]}"
+
+
+class RateLimiter:
+    """Leaky-bucket throttle over requests-per-minute AND tokens-per-minute.
+
+    Capacity refills continuously; acquire() waits until there is room for
+    one request of the given token cost, then drains it.
+    """
+
+    def __init__(self, rpm: int = 500, tpm: int = 90000):
+        if rpm < 1 or tpm < 1:
+            # acquire() could never find a full request's worth of capacity
+            raise ValueError(f"Rate limits must be at least 1 (got rpm={rpm}, tpm={tpm})")
+        self.max_requests_per_minute = rpm
+        self.max_tokens_per_minute = tpm
+        self.available_request_capacity = float(rpm)
+        self.available_token_capacity = float(tpm)
+        self._last_update = time.monotonic()
+
+    def _refill(self):
+        """Top up both buckets based on the time elapsed since the last refill"""
+        now = time.monotonic()
+        dt = now - self._last_update
+        self._last_update = now
+
+        self.available_request_capacity = min(
+            self.available_request_capacity + (self.max_requests_per_minute / 60) * dt,
+            self.max_requests_per_minute
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + (self.max_tokens_per_minute / 60) * dt,
+            self.max_tokens_per_minute
+        )
+
+    async def acquire(self, tokens: int):
+        """Wait until capacity for one request of `tokens` tokens is available, then consume it"""
+        # Never ask for more than a full bucket, or we'd wait forever
+        tokens = min(tokens, self.max_tokens_per_minute)
+        while True:
+            self._refill()
+            if self.available_request_capacity >= 1 and self.available_token_capacity >= tokens:
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return
+            await asyncio.sleep(0.01)
+
+    def sync_from_headers(self, headers):
+        """Re-sync counters with the server's x-ratelimit-remaining-* headers when it reports less than we think"""
+        remaining_requests = headers.get('x-ratelimit-remaining-requests')
+        remaining_tokens = headers.get('x-ratelimit-remaining-tokens')
+
+        try:
+            if remaining_requests is not None:
+                self.available_request_capacity = min(self.available_request_capacity, float(remaining_requests))
+            if remaining_tokens is not None:
+                self.available_token_capacity = min(self.available_token_capacity, float(remaining_tokens))
+        except ValueError:
+            # Malformed header - keep our own estimate
+            pass
@@ -3,25 +3,26 @@ WordPress Client - WordPress Integration Module
 Created: 24 Sept 2025
 Author: mstf
 
-Handles WordPress XML-RPC connection and post creation
+Handles WordPress connection and post creation over the REST API
+(async, default) or legacy XML-RPC
 """
 
-# Fix for Python 3.9+ collections.Iterable issue
-import collections.abc
-import collections
-collections.Iterable = collections.abc.Iterable
-
-from wordpress_xmlrpc import Client
-from wordpress_xmlrpc.methods.posts import GetPosts, NewPost
-from wordpress_xmlrpc.methods import posts
-from wordpress_xmlrpc import WordPressPost
+# wordpress_xmlrpc and httpx are imported lazily (they're only needed when publishing)
 from dotenv import load_dotenv
+import base64
 import os
 from typing import Optional
 
 class WordPressClient:
     """WordPress client for publishing blog posts"""
 
+    # Custom field keys that receive the meta description
+    _META_KEYS = (
+        '_yoast_wpseo_metadesc',  # Yoast SEO
+        '_aioseop_description',   # All in One SEO
+        'meta_description',       # Generic meta description
+    )
+
     def __init__(self):
         """Initialize WordPress client"""
         # Load environment variables
@@ -37,10 +38,19 @@ class WordPressClient:
     def _create_client(self):
         """Create WordPress XML-RPC client"""
         try:
+            # Fix for Python 3.9+ collections.Iterable issue (must run before importing wordpress_xmlrpc)
+            import collections.abc
+            import collections
+            collections.Iterable = collections.abc.Iterable
+
+            from wordpress_xmlrpc import Client
+
             if not all([self.wp_url, self.wp_username, self.wp_password]):
                 raise ValueError("Missing WordPress credentials in .env file")
 
-            self.client = Client(self.wp_url, self.wp_username, self.wp_password)
+            # Accept the site URL too - XML-RPC lives at /xmlrpc.php
+            xmlrpc_url = self.wp_url if self.wp_url.endswith('xmlrpc.php') else self.wp_url.rstrip('/') + '/xmlrpc.php'
+            self.client = Client(xmlrpc_url, self.wp_username, self.wp_password)
 
         except Exception as e:
             raise Exception(f"Failed to create WordPress client: {e}")
@@ -51,6 +61,8 @@ class WordPressClient:
             if not self.client:
                 return False
 
+            from wordpress_xmlrpc.methods.posts import GetPosts
+
             # Try to get one post to test connection
             test_posts = self.client.call(GetPosts({'number': 1}))
             return True
@@ -65,6 +77,8 @@ class WordPressClient:
             if not self.client:
                 return []
 
+            from wordpress_xmlrpc.methods.posts import GetPosts
+
             recent_posts = self.client.call(GetPosts({'number': count}))
             return recent_posts
 
@@ -78,6 +92,9 @@ class WordPressClient:
             if not self.client:
                 raise Exception("WordPress client not initialized")
 
+            from wordpress_xmlrpc import WordPressPost
+            from wordpress_xmlrpc.methods.posts import NewPost
+
             post = WordPressPost()
             post.title = title
             post.content = content
@@ -90,23 +107,10 @@ class WordPressClient:
                 # Fallback to first 200 chars of content
                 post.excerpt = content[:200] + "..." if len(content) > 200 else content
 
-            # Add custom fields for SEO (if your theme supports it)
-            post.custom_fields = []
-
-            if meta_description:
-                # Add meta description as custom field for SEO plugins
-                post.custom_fields.append({
-                    'key': '_yoast_wpseo_metadesc',  # Yoast SEO
-                    'value': meta_description
-                })
-                post.custom_fields.append({
-                    'key': '_aioseop_description',  # All in One SEO
-                    'value': meta_description
-                })
-                post.custom_fields.append({
-                    'key': 'meta_description',  # Generic meta description
-                    'value': meta_description
-                })
+            # Add meta description as custom fields for SEO plugins (if your theme supports it)
+            post.custom_fields = [
+                {'key': key, 'value': meta_description} for key in self._META_KEYS
+            ] if meta_description else []
 
             post_id = self.client.call(NewPost(post))
             return post_id
@@ -122,3 +126,95 @@ class WordPressClient:
             'password_set': bool(self.wp_password),
             'client_ready': bool(self.client)
         }
+
+
+class WordPressRestClient:
+    """WordPress REST API client for publishing blog posts asynchronously"""
+
+    # Same SEO custom fields as the XML-RPC client
+    _META_KEYS = WordPressClient._META_KEYS
+
+    def __init__(self, http_client=None):
+        """Initialize WordPress REST client; publishes go through http_client (an httpx.AsyncClient, may be attached later)"""
+        # Load environment variables
+        load_dotenv()
+
+        self.wp_url = os.getenv("WORDPRESS_URL")
+        self.wp_username = os.getenv("WORDPRESS_USERNAME")
+        self.wp_password = os.getenv("WORDPRESS_PASSWORD")  # An application password works best
+
+        self.http_client = http_client
+        self._create_client()
+
+    def _create_client(self):
+        """Resolve the REST endpoint and auth header"""
+        try:
+            if not all([self.wp_url, self.wp_username, self.wp_password]):
+                raise ValueError("Missing WordPress credentials in .env file")
+
+            # Accept either the site URL or the old .../xmlrpc.php URL
+            site_url = self.wp_url.rstrip('/').removesuffix('/xmlrpc.php')
+            self.api_url = f"{site_url}/wp-json/wp/v2"
+
+            token = base64.b64encode(f"{self.wp_username}:{self.wp_password}".encode('utf-8')).decode('ascii')
+            self._headers = {'Authorization': f'Basic {token}'}
+
+        except Exception as e:
+            raise Exception(f"Failed to create WordPress client: {e}")
+
+    def test_connection(self) -> bool:
+        """Test WordPress connection and credentials"""
+        try:
+            import httpx
+
+            # One-off sync request: the shared async pool belongs to whichever event loop publishes
+            response = httpx.get(f"{self.api_url}/users/me", headers=self._headers, timeout=10.0)
+            response.raise_for_status()
+            return True
+
+        except Exception as e:
+            print(f"WordPress connection test failed: {e}")
+            return False
+
+    async def create_post(self, title: str, content: str, status: str = 'draft', meta_description: str = None,
+                          excerpt: str = None) -> Optional[int]:
+        """Create a new WordPress post with meta description"""
+        try:
+            if self.http_client is None:
+                raise Exception("No HTTP client attached for REST publishing")
+
+            # Set excerpt (meta description)
+            if excerpt is None:
+                if meta_description:
+                    excerpt = meta_description
+                else:
+                    # Fallback to first 200 chars of content
+                    excerpt = content[:200] + "..." if len(content) > 200 else content
+
+            payload = {
+                'title': title,
+                'content': content,
+                'status': status,  # draft, publish, private
+                'excerpt': excerpt,
+            }
+
+            # Add meta description for SEO plugins (only saved for meta keys registered with the REST API)
+            if meta_description:
+                payload['meta'] = {key: meta_description for key in self._META_KEYS}
+
+            response = await self.http_client.post(f"{self.api_url}/posts", json=payload, headers=self._headers)
+            response.raise_for_status()
+            return response.json()['id']
+
+        except Exception as e:
+            raise Exception(f"Failed to create WordPress post: {e}")
+
+    def get_connection_info(self) -> dict:
+        """Get connection information for debugging"""
+        return {
+            'url': self.wp_url,
+            'api_url': getattr(self, 'api_url', None),
+            'username': self.wp_username,
+            'password_set': bool(self.wp_password),
+            'client_ready': self.http_client is not None
+        }